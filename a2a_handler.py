@@ -2,15 +2,242 @@ from models.a2a import (
     A2AMessage, MessagePart, TaskResult, TaskStatus, 
     Artifact, JSONRPCRequest, JSONRPCResponse
 )
-from typing import List, Dict, Any
+from collections import OrderedDict
+from typing import List, Dict, Any, Callable, Hashable
 from uuid import uuid4
+import asyncio
+import hashlib
 import json
 import re
-import base64
 import logging
+import time
+
+try:
+    import orjson
+    
+    def _dumps(obj: Any) -> str:
+        try:
+            return orjson.dumps(obj).decode()
+        except TypeError:
+            # orjson rejects some values json accepts, e.g. integers wider than 64 bits
+            return json.dumps(obj)
+    
+    _loads = orjson.loads
+except ImportError:
+    _dumps = json.dumps
+    _loads = json.loads
 
 logger = logging.getLogger(__name__)
 
+# Conversation history limits: oldest contexts are evicted first
+MAX_CONTEXTS = 1024
+MAX_TURNS = 32
+# Only the most recent messages are echoed back in each task result
+MAX_HISTORY_RETURN = 8
+
+# Concurrent analysis requests arriving within this window share one backend call
+BATCH_WINDOW = 0.005
+BATCH_SIZE = 32
+
+# Generated responses are reused for repeated messages until they expire
+RESPONSE_CACHE_TTL = 300
+RESPONSE_CACHE_SIZE = 4096
+RESPONSE_CACHE_BYTES = 32 * 1024 * 1024
+
+# Analysis results are served by reference from /artifacts/{id} for a while
+ARTIFACT_TTL = 600
+MAX_ARTIFACTS = 1024
+
+# Package specifications, e.g. flask==2.0.1 (Python) or express@4.17.1 (npm)
+_PACKAGE_RE = re.compile(
+    r'\b(?:(?P<pyname>[a-zA-Z0-9_-]+)\s*(?P<pyop>==|>=|<=|~=|!=|[<>])\s*(?P<pyver>[0-9][0-9.]*)'
+    r'|(?P<npmname>[a-zA-Z0-9_-]+)@(?P<npmver>[0-9.^~]+))\b'
+)
+_HELP_RE = re.compile(r'\b(help|commands|what can you do)\b')
+
+_HELP_MESSAGE = """
+## Package Health Monitor Agent 📦
+
+I can help you check the health of your Python and npm packages!
+
+### Commands:
+
+**Analyze Python packages:**
+- "Check flask==2.0.1, requests>=2.25.0"
+- "Analyze Python packages: numpy==1.19.0, pandas"
+
+**Analyze npm packages:**
+- "Check express@4.17.1, axios@0.21.1"
+- "Analyze npm packages: react@17.0.0, lodash@4.17.20"
+
+I'll check for:
+✅ Outdated versions
+✅ Security vulnerabilities (CVEs)
+✅ Deprecated packages
+✅ Overall health score
+
+Just send me a list of packages and I'll analyze them for you!
+"""
+
+class PackageBatcher:
+    """Coalesces concurrent package analysis requests into one backend call"""
+    
+    def __init__(self, analyze: Callable, summarize: Callable):
+        """
+        Initialize the batcher
+        
+        Args:
+            analyze: Coroutine function taking a list of unique package keys and
+                returning one package result per key, in the same order
+            summarize: Function building an analysis result from package results
+        """
+        self.analyze = analyze
+        self.summarize = summarize
+        self.queue = None
+        self._worker = None
+        self._pending = set()
+    
+    async def submit(self, keys: List[Hashable]) -> Dict[str, Any]:
+        """Queue package keys for the next batch and wait for their analysis"""
+        # Started lazily: the handler is created before the event loop runs
+        if self._worker is None or self._worker.done():
+            self.queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run())
+        
+        future = asyncio.get_running_loop().create_future()
+        self.queue.put_nowait((keys, future))
+        return await future
+    
+    async def _run(self):
+        """Drain the queue, dispatching one backend call per batch"""
+        while True:
+            batch = [await self.queue.get()]
+            await asyncio.sleep(BATCH_WINDOW)
+            while len(batch) < BATCH_SIZE and not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+            
+            task = asyncio.create_task(self._dispatch(batch))
+            self._pending.add(task)
+            task.add_done_callback(self._pending.discard)
+    
+    async def _dispatch(self, batch: list):
+        """Analyze the union of a batch and split the results per request"""
+        union = list(dict.fromkeys(key for keys, _ in batch for key in keys))
+        logger.info(f"Dispatching batch of {len(batch)} request(s), {len(union)} unique package(s)")
+        
+        try:
+            results = dict(zip(union, await self.analyze(union)))
+            for keys, future in batch:
+                if not future.done():
+                    future.set_result(self.summarize([results[key] for key in keys]))
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+
+# Fixed parts of the analysis report
+_HEADER_TMPL = (
+    "## {ecosystem} Package Health Report {emoji}\n\n"
+    "**Overall Health Score:** {score}/100\n"
+    "**Total Packages:** {total}\n"
+    "**Outdated:** {outdated}\n"
+    "**With Vulnerabilities:** {vulnerable}\n\n"
+)
+_PACKAGE_TMPL = (
+    "{emoji} **{name}** ({current})\n"
+    "   - Latest: {latest}\n"
+    "   - Health: {score}/100\n"
+)
+
+def _score_emoji(score: int) -> str:
+    """Pick the status emoji for a health score"""
+    if score >= 80:
+        return "✅"
+    if score >= 60:
+        return "⚠️"
+    return "❌"
+
+def _append_text_part(part: MessagePart, content_parts: List[str]):
+    """Collect the text of a text/message part"""
+    if part.text:
+        content_parts.append(part.text)
+
+def _append_data_part(part: MessagePart, content_parts: List[str]):
+    """Collect the content of a file/data part"""
+    data = part.data
+    if not data:
+        return
+    
+    # The model only accepts objects here, so serialize them as JSON
+    content_parts.append(_dumps(data))
+
+_PART_HANDLERS = {
+    "text": _append_text_part,
+    "message": _append_text_part,
+    "file": _append_data_part,
+    "data": _append_data_part,
+}
+
+class ResponseCache:
+    """LRU cache of generated responses keyed on normalized message text"""
+    
+    def __init__(self, ttl: float, maxsize: int, maxbytes: int):
+        """
+        Initialize the cache
+        
+        Args:
+            ttl: Seconds a response stays valid
+            maxsize: Maximum number of cached responses
+            maxbytes: Maximum approximate size of all cached responses
+        """
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        self.nbytes = 0
+        # Results are kept serialized: that is the size counted against maxbytes, and every
+        # hit decodes its own copy, so callers can't mutate what later hits are served
+        self.entries: OrderedDict[bytes, tuple[float, int, str, str | None]] = OrderedDict()
+    
+    @staticmethod
+    def key(text: str) -> bytes:
+        """Build the cache key for normalized message text"""
+        return hashlib.blake2b(text.strip().encode(), digest_size=16).digest()
+    
+    def get(self, key: bytes) -> tuple[str, Dict[str, Any] | None] | None:
+        """Return a cached response, or None if missing or expired"""
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        
+        stored_at, _, response_text, result_json = entry
+        if time.monotonic() - stored_at > self.ttl:
+            self._discard(key)
+            return None
+        
+        self.entries.move_to_end(key)
+        return response_text, _loads(result_json) if result_json else None
+    
+    def put(self, key: bytes, response_text: str, result: Dict[str, Any] | None):
+        """Store a response, evicting the least recently used ones over the limits"""
+        result_json = _dumps(result) if result else None
+        size = len(response_text.encode()) + (len(result_json) if result_json else 0)
+        if size > self.maxbytes:
+            return
+        
+        self._discard(key)
+        self.entries[key] = (time.monotonic(), size, response_text, result_json)
+        self.nbytes += size
+        
+        while len(self.entries) > self.maxsize or self.nbytes > self.maxbytes:
+            _, (_, evicted_size, _, _) = self.entries.popitem(last=False)
+            self.nbytes -= evicted_size
+    
+    def _discard(self, key: bytes):
+        """Remove a response if present"""
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.nbytes -= entry[1]
+
 class A2AHandler:
     """Handler for A2A protocol messages"""
     
@@ -22,7 +249,15 @@ class A2AHandler:
             package_checker: Object with methods to check packages
         """
         self.package_checker = package_checker
-        self.conversation_history: Dict[str, List[A2AMessage]] = {}
+        self.python_batcher = PackageBatcher(self._analyze_python_batch, package_checker.summarize)
+        self.npm_batcher = PackageBatcher(self._analyze_npm_batch, package_checker.summarize)
+        self.response_cache = ResponseCache(RESPONSE_CACHE_TTL, RESPONSE_CACHE_SIZE, RESPONSE_CACHE_BYTES)
+        self.artifact_store: OrderedDict[str, tuple[float, Dict[str, Any]]] = OrderedDict()
+        self._methods = {
+            "message/send": self._handle_message_send,
+            "execute": self._handle_execute,
+        }
+        self.conversation_history: OrderedDict[str, List[A2AMessage]] = OrderedDict()
     
     async def handle_message(self, request: JSONRPCRequest) -> JSONRPCResponse:
         """
@@ -37,17 +272,15 @@ class A2AHandler:
         try:
             logger.info(f"A2A request - method: {request.method}, id: {request.id}")
             
-            if request.method == "message/send":
-                return await self._handle_message_send(request)
-            elif request.method == "execute":
-                return await self._handle_execute(request)
-            else:
+            handler = self._methods.get(request.method)
+            if handler is None:
                 logger.warning(f"Unknown method: {request.method}")
                 return self._error_response(
                     request.id,
                     -32601,
                     f"Method not found: {request.method}"
                 )
+            return await handler(request)
         except AttributeError as e:
             logger.error(f"Attribute error in handler: {e}")
             return self._error_response(
@@ -75,13 +308,14 @@ class A2AHandler:
         logger.info(f"Extracted text (first 200 chars): {user_text[:200] if user_text else '(empty)'}")
         
         # Store in conversation history
-        context_id = user_message.taskId or str(uuid4())
-        if context_id not in self.conversation_history:
-            self.conversation_history[context_id] = []
-        self.conversation_history[context_id].append(user_message)
+        context_id = user_message.taskId or uuid4().hex
+        history = self._touch(context_id)
+        history.append(user_message)
+        del history[:-MAX_TURNS]
         
         # Process the message and generate response
-        response_text, artifacts = await self._process_user_message(user_text)
+        inline_artifacts = params.configuration is not None and params.configuration.inlineArtifacts
+        response_text, artifacts = await self._process_user_message(user_text, inline_artifacts)
         logger.info(f"Generated response (first 200 chars): {response_text[:200]}")
         
         # Create agent response message
@@ -91,18 +325,19 @@ class A2AHandler:
             taskId=context_id
         )
         
-        self.conversation_history[context_id].append(agent_message)
+        history.append(agent_message)
+        del history[:-MAX_TURNS]
         
         # Create task result
         task_result = TaskResult(
-            id=user_message.taskId or str(uuid4()),
+            id=user_message.taskId or uuid4().hex,
             contextId=context_id,
             status=TaskStatus(
                 state="completed",
                 message=agent_message
             ),
             artifacts=artifacts,
-            history=self.conversation_history[context_id]
+            history=history[-MAX_HISTORY_RETURN:]
         )
         
         return JSONRPCResponse(
@@ -114,13 +349,12 @@ class A2AHandler:
         """Handle execute method"""
         # Access params directly - now properly typed as ExecuteParams
         params = request.params
-        context_id = params.contextId or str(uuid4())
+        context_id = params.contextId or uuid4().hex
         
         # Store messages in history
-        if context_id not in self.conversation_history:
-            self.conversation_history[context_id] = []
-        
-        self.conversation_history[context_id].extend(params.messages)
+        history = self._touch(context_id)
+        history.extend(params.messages)
+        del history[:-MAX_TURNS]
         
         # Get the last user message
         user_messages = [msg for msg in params.messages if msg.role == "user"]
@@ -134,7 +368,8 @@ class A2AHandler:
         user_text = self._extract_text_from_message(user_messages[-1])
         
         # Process the message
-        response_text, artifacts = await self._process_user_message(user_text)
+        inline_artifacts = params.configuration is not None and params.configuration.inlineArtifacts
+        response_text, artifacts = await self._process_user_message(user_text, inline_artifacts)
         
         # Create agent response
         agent_message = A2AMessage(
@@ -143,17 +378,18 @@ class A2AHandler:
             taskId=params.taskId
         )
         
-        self.conversation_history[context_id].append(agent_message)
+        history.append(agent_message)
+        del history[:-MAX_TURNS]
         
         task_result = TaskResult(
-            id=params.taskId or str(uuid4()),
+            id=params.taskId or uuid4().hex,
             contextId=context_id,
             status=TaskStatus(
                 state="completed",
                 message=agent_message
             ),
             artifacts=artifacts,
-            history=self.conversation_history[context_id]
+            history=history[-MAX_HISTORY_RETURN:]
         )
         
         return JSONRPCResponse(
@@ -161,52 +397,103 @@ class A2AHandler:
             result=task_result
         )
     
-    async def _process_user_message(self, user_text: str) -> tuple[str, List[Artifact]]:
+    def _touch(self, context_id: str) -> List[A2AMessage]:
+        """Get the history for a context, marking it as most recently used"""
+        history = self.conversation_history.get(context_id)
+        if history is None:
+            history = self.conversation_history[context_id] = []
+            while len(self.conversation_history) > MAX_CONTEXTS:
+                self.conversation_history.popitem(last=False)
+        else:
+            self.conversation_history.move_to_end(context_id)
+        return history
+    
+    async def _process_user_message(self, user_text: str, inline_artifacts: bool = False) -> tuple[str, List[Artifact]]:
         """
         Process user message and generate response
         
         Args:
             user_text: User's message text
+            inline_artifacts: Embed analysis results instead of referencing them
             
         Returns:
             Tuple of (response_text, artifacts)
         """
+        # Package names are case-insensitive on PyPI and npm
         user_text_lower = user_text.lower()
         
+        key = ResponseCache.key(user_text_lower)
+        cached = self.response_cache.get(key)
+        if cached is not None:
+            logger.info("Serving response from cache")
+            response_text, result = cached
+        else:
+            response_text, result = await self._generate_response(user_text_lower)
+            # Failed lookups would otherwise be served as healthy packages until the entry expires
+            if not (result and result.get("lookup_failed_count")):
+                self.response_cache.put(key, response_text, result)
+        
+        artifacts = [self._create_artifact(result, inline_artifacts)] if result else []
+        return response_text, artifacts
+    
+    async def _generate_response(self, user_text_lower: str) -> tuple[str, Dict[str, Any] | None]:
+        """Extract packages from lower-cased user text and analyze them"""
         # Check if user is asking for help
-        if any(word in user_text_lower for word in ["help", "what can you do", "commands"]):
-            return self._get_help_message(), []
+        if _HELP_RE.search(user_text_lower):
+            return _HELP_MESSAGE, None
+        
+        python_packages, npm_packages = self._extract_all(user_text_lower)
         
         # Check if user wants to analyze Python packages
         if "python" in user_text_lower or "pip" in user_text_lower or "requirements" in user_text_lower:
-            packages = self._extract_python_packages(user_text)
-            if packages:
-                result = await self.package_checker.analyze_python(packages)
-                return self._format_analysis_result(result, "Python"), [self._create_artifact(result)]
+            if python_packages:
+                result = await self.python_batcher.submit(python_packages)
+                return self._format_analysis_result(result, "Python"), result
             else:
-                return "Please provide Python packages to analyze. Example: `flask==2.0.1, requests>=2.25.0`", []
+                return "Please provide Python packages to analyze. Example: `flask==2.0.1, requests>=2.25.0`", None
         
         # Check if user wants to analyze npm packages
         if "npm" in user_text_lower or "node" in user_text_lower or "javascript" in user_text_lower:
-            packages = self._extract_npm_packages(user_text)
-            if packages:
-                result = await self.package_checker.analyze_npm(packages)
-                return self._format_analysis_result(result, "npm"), [self._create_artifact(result)]
+            if npm_packages:
+                result = await self.npm_batcher.submit(list(npm_packages.items()))
+                return self._format_analysis_result(result, "npm"), result
             else:
-                return "Please provide npm packages to analyze. Example: `express@4.17.1, axios@0.21.1`", []
-        
-        # Default response - try to extract packages from text
-        python_packages = self._extract_python_packages(user_text)
-        npm_packages = self._extract_npm_packages(user_text)
+                return "Please provide npm packages to analyze. Example: `express@4.17.1, axios@0.21.1`", None
         
+        # Default response - analyze whichever packages were found
         if python_packages:
-            result = await self.package_checker.analyze_python(python_packages)
-            return self._format_analysis_result(result, "Python"), [self._create_artifact(result)]
+            result = await self.python_batcher.submit(python_packages)
+            return self._format_analysis_result(result, "Python"), result
         elif npm_packages:
-            result = await self.package_checker.analyze_npm(npm_packages)
-            return self._format_analysis_result(result, "npm"), [self._create_artifact(result)]
+            result = await self.npm_batcher.submit(list(npm_packages.items()))
+            return self._format_analysis_result(result, "npm"), result
         else:
-            return self._get_help_message(), []
+            return _HELP_MESSAGE, None
+    
+    async def _analyze_python_batch(self, packages: List[str]) -> List[Dict[str, Any]]:
+        """Analyze a batch of Python package specifications"""
+        result = await self.package_checker.analyze_python(packages)
+        return result.get("packages", [])
+    
+    async def _analyze_npm_batch(self, packages: List[tuple[str, str]]) -> List[Dict[str, Any]]:
+        """Analyze a batch of (name, version) npm packages"""
+        # analyze_npm takes a name -> version mapping, so the same package
+        # requested at different versions is split across separate calls
+        groups: List[Dict[str, str]] = []
+        for name, version in packages:
+            for group in groups:
+                if name not in group:
+                    group[name] = version
+                    break
+            else:
+                groups.append({name: version})
+        
+        results = await asyncio.gather(*(self.package_checker.analyze_npm(group) for group in groups))
+        
+        by_package = {}
+        for group, result in zip(groups, results):
+            by_package.update(zip(group.items(), result.get("packages", [])))
+        return [by_package[package] for package in packages]
     
     def _extract_text_from_message(self, message: A2AMessage) -> str:
         """Extract text content and file data from message parts"""
@@ -214,65 +501,33 @@ class A2AHandler:
         
         for part in message.parts:
             # Accept any kind value for Telex compatibility
-            if hasattr(part, 'kind'):
-                kind = getattr(part, 'kind', '').lower()
-                
-                if (kind == "text" or kind == "message") and part.text:
-                    content_parts.append(part.text)
-                elif (kind == "file" or kind == "data") and hasattr(part, 'data') and part.data:
-                    # Handle file upload - decode base64 or direct text
-                    try:
-                        if isinstance(part.data, str):
-                            # Try to decode as base64
-                            file_content = base64.b64decode(part.data).decode('utf-8')
-                            content_parts.append(file_content)
-                        else:
-                            # If already dict/object, convert to string
-                            file_content = str(part.data) if not isinstance(part.data, str) else part.data
-                            content_parts.append(file_content)
-                    except Exception as decode_error:
-                        logger.warning(f"Failed to decode file: {decode_error}")
-                        # If not base64, treat as plain text
-                        content_parts.append(str(part.data))
+            handler = _PART_HANDLERS.get(part.kind.lower())
+            if handler:
+                handler(part, content_parts)
         
         return " ".join(content_parts)
     
-    def _extract_python_packages(self, text: str) -> List[str]:
-        """Extract Python package specifications from text"""
-        packages = []
-        
-        # Pattern for packages like: flask==2.0.1, requests>=2.25.0
-        pattern = r'\b([a-zA-Z0-9_-]+)\s*([=<>~!]+)\s*([0-9.]+)\b'
-        matches = re.findall(pattern, text)
-        
-        for match in matches:
-            pkg_name, operator, version = match
-            packages.append(f"{pkg_name}{operator}{version}")
-        
-        # Also look for simple package names
-        words = text.split()
-        for word in words:
-            word = word.strip(',')
-            # Check if it looks like a package (contains == or >= etc)
-            if any(op in word for op in ['==', '>=', '<=', '>', '<', '~=']):
-                if word not in packages:
-                    packages.append(word)
-        
-        return packages
-    
-    def _extract_npm_packages(self, text: str) -> Dict[str, str]:
-        """Extract npm package specifications from text"""
-        dependencies = {}
-        
-        # Pattern for packages like: express@4.17.1, axios@0.21.1
-        pattern = r'\b([a-zA-Z0-9_-]+)@([0-9.^~]+)\b'
-        matches = re.findall(pattern, text)
-        
-        for match in matches:
-            pkg_name, version = match
-            dependencies[pkg_name] = version
+    def _extract_all(self, text: str) -> tuple[List[str], Dict[str, str]]:
+        """Extract Python and npm package specifications from text in one pass"""
+        # Every specification contains one of these, skip the regex for plain chat
+        if '=' not in text and '<' not in text and '>' not in text and '@' not in text:
+            return [], {}
+        
+        python_packages = {}
+        npm_packages = {}
+        
+        for match in _PACKAGE_RE.finditer(text):
+            if match.lastgroup == "pyver":
+                name, op, version = match.group("pyname", "pyop", "pyver")
+                # PyPI names are case-insensitive and treat - and _ alike,
+                # the first pin of a package wins
+                python_packages.setdefault(name.lower().replace("_", "-"), name + op + version)
+            else:
+                # The last pin of an npm package wins
+                name, version = match.group("npmname", "npmver")
+                npm_packages[name] = version
         
-        return dependencies
+        return list(python_packages.values()), npm_packages
     
     def _format_analysis_result(self, result: Dict[str, Any], ecosystem: str) -> str:
         """Format package analysis result as readable text"""
@@ -284,24 +539,15 @@ class A2AHandler:
         vulnerable = result.get("vulnerable_count", 0)
         score = result.get("overall_health_score", 0)
         
-        # Create health emoji
-        if score >= 80:
-            health_emoji = "✅"
-        elif score >= 60:
-            health_emoji = "⚠️"
-        else:
-            health_emoji = "❌"
-        
-        response = f"## {ecosystem} Package Health Report {health_emoji}\n\n"
-        response += f"**Overall Health Score:** {score}/100\n"
-        response += f"**Total Packages:** {total}\n"
-        response += f"**Outdated:** {outdated}\n"
-        response += f"**With Vulnerabilities:** {vulnerable}\n\n"
+        parts = [_HEADER_TMPL.format(
+            ecosystem=ecosystem, emoji=_score_emoji(score), score=score,
+            total=total, outdated=outdated, vulnerable=vulnerable
+        )]
         
         # Add details for each package
         packages = result.get("packages", [])
         if packages:
-            response += "### Package Details:\n\n"
+            parts.append("### Package Details:\n\n")
             for pkg in packages:
                 name = pkg.get("name", "unknown")
                 current = pkg.get("current_version", "N/A")
@@ -309,60 +555,52 @@ class A2AHandler:
                 pkg_score = pkg.get("health_score", 0)
                 vuln_count = pkg.get("vulnerability_count", 0)
                 
-                if pkg_score >= 80:
-                    status = "✅"
-                elif pkg_score >= 60:
-                    status = "⚠️"
-                else:
-                    status = "❌"
-                
-                response += f"{status} **{name}** ({current})\n"
-                response += f"   - Latest: {latest}\n"
-                response += f"   - Health: {pkg_score}/100\n"
+                parts.append(_PACKAGE_TMPL.format(
+                    emoji=_score_emoji(pkg_score), name=name, current=current,
+                    latest=latest, score=pkg_score
+                ))
                 
                 if vuln_count > 0:
-                    response += f"   - ⚠️ {vuln_count} vulnerability/ies found\n"
+                    parts.append(f"   - ⚠️ {vuln_count} vulnerability/ies found\n")
                 
                 recommendation = pkg.get("recommendation", "")
                 if recommendation:
-                    response += f"   - 💡 {recommendation}\n"
+                    parts.append(f"   - 💡 {recommendation}\n")
                 
-                response += "\n"
+                parts.append("\n")
         
-        return response
+        return "".join(parts)
     
-    def _create_artifact(self, data: Dict[str, Any]) -> Artifact:
-        """Create an artifact from analysis data"""
+    def _create_artifact(self, data: Dict[str, Any], inline: bool = False) -> Artifact:
+        """Create an artifact from analysis data, by reference unless inline"""
+        if inline:
+            return Artifact(
+                name="package-health-report.json",
+                parts=[MessagePart(kind="data", data=data)]
+            )
+        
+        artifact_id = uuid4().hex
+        self.artifact_store[artifact_id] = (time.monotonic(), data)
+        while len(self.artifact_store) > MAX_ARTIFACTS:
+            self.artifact_store.popitem(last=False)
+        
         return Artifact(
+            artifactId=artifact_id,
             name="package-health-report.json",
-            parts=[MessagePart(kind="data", data=data)]
+            parts=[MessagePart(kind="data", data={"$ref": f"/artifacts/{artifact_id}"})]
         )
     
-    def _get_help_message(self) -> str:
-        """Return help message"""
-        return """
-## Package Health Monitor Agent 📦
-
-I can help you check the health of your Python and npm packages!
-
-### Commands:
-
-**Analyze Python packages:**
-- "Check flask==2.0.1, requests>=2.25.0"
-- "Analyze Python packages: numpy==1.19.0, pandas"
-
-**Analyze npm packages:**
-- "Check express@4.17.1, axios@0.21.1"
-- "Analyze npm packages: react@17.0.0, lodash@4.17.20"
-
-I'll check for:
-✅ Outdated versions
-✅ Security vulnerabilities (CVEs)
-✅ Deprecated packages
-✅ Overall health score
-
-Just send me a list of packages and I'll analyze them for you!
-"""
+    def get_artifact(self, artifact_id: str) -> Dict[str, Any] | None:
+        """Return stored analysis data for an artifact, or None if missing or expired"""
+        entry = self.artifact_store.get(artifact_id)
+        if entry is None:
+            return None
+        
+        stored_at, data = entry
+        if time.monotonic() - stored_at > ARTIFACT_TTL:
+            del self.artifact_store[artifact_id]
+            return None
+        return data
     
     def _error_response(self, request_id: str, code: int, message: str) -> JSONRPCResponse:
         """Create an error response"""
@@ -1,9 +1,19 @@
 from fastapi import FastAPI, HTTPException, Request, Query
-from fastapi.responses import JSONResponse
-from typing import List, Dict, Optional, Any
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
+from contextlib import asynccontextmanager
+from typing import List, Dict, Optional, Any, AsyncIterator, Awaitable, Callable, Hashable, Mapping, Tuple
+from cachetools import TTLCache
+from pydantic import ValidationError
 from datetime import datetime
-import requests
+import asyncio
+import httpx
+import json
 import logging
+import orjson
+import os
+import re
+import sqlite3
+import threading
 from models.a2a import JSONRPCRequest, JSONRPCResponse
 from models.schemas import (
     PackageDependency,
@@ -21,247 +31,523 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+HTTP_TIMEOUT = httpx.Timeout(10)
+# HTTP/2 multiplexes concurrent requests over a handful of connections per host
+HTTP_LIMITS = httpx.Limits(max_connections=4, max_keepalive_connections=4)
+
+# Cap in-flight requests per upstream API to stay clear of rate limits
+MAX_CONCURRENT_REQUESTS = int(os.getenv("MAX_CONCURRENT_REQUESTS", "16"))
+
+# Rate-limited and failed upstream requests, and dropped connections, are retried with exponential backoff
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+MAX_RETRIES = 3
+RETRY_BACKOFF = 0.5
+
+# Registry metadata and OSV results are reused across requests for 15 minutes
+pypi_cache = TTLCache(maxsize=10_000, ttl=900)
+npm_cache = TTLCache(maxsize=10_000, ttl=900)
+osv_cache = TTLCache(maxsize=10_000, ttl=900)
+osv_vuln_cache = TTLCache(maxsize=10_000, ttl=900)
+# Lookups in flight, shared by concurrent callers missing the same key
+_inflight: Dict[Hashable, asyncio.Task] = {}
+
+OSV_API = "https://api.osv.dev/v1"
+# Maximum number of queries OSV accepts in one querybatch request
+OSV_BATCH_SIZE = 1000
+
+# Requirement line: name, optional [extras], then an optional version specifier
+_REQ_RE = re.compile(r'^([A-Za-z0-9_.\-]+)\s*(?:\[[^\]]*\])?\s*(?:(===|==|>=|<=|~=|!=|>|<)\s*(.*?))?\s*$')
+_PYPI_SEPARATORS = re.compile(r'[-_.]+')
+# Leading npm range operator, e.g. the "^" of "^1.2.3" or the ">=" of ">=1.0.0"
+_NPM_PREFIX = re.compile(r'^[\^~]?(?:>=|<=|>|<|=)?\s*')
+
+# Registry metadata persisted across restarts, revalidated with ETag/Last-Modified
+REGISTRY_CACHE_PATH = os.getenv("REGISTRY_CACHE_PATH", "registry.sqlite")
+
+class RegistryStore:
+    """SQLite store of registry metadata and the validators it was served with
+    
+    Calls block on disk I/O, so async code runs them in worker threads; the lock
+    serializes those threads on the shared connection.
+    """
+    
+    def __init__(self, path: str):
+        self.path = path
+        self.db: Optional[sqlite3.Connection] = None
+        self.lock = threading.Lock()
+    
+    def _connect(self) -> sqlite3.Connection:
+        if self.db is None:
+            self.db = sqlite3.connect(self.path, check_same_thread=False)
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS registry ("
+                "url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, body TEXT)"
+            )
+        return self.db
+    
+    def get(self, url: str) -> Optional[tuple[Optional[str], Optional[str], Dict]]:
+        """Return (etag, last_modified, metadata) stored for a URL"""
+        with self.lock:
+            row = self._connect().execute(
+                "SELECT etag, last_modified, body FROM registry WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        etag, last_modified, body = row
+        return etag, last_modified, json.loads(body)
+    
+    def put(self, url: str, etag: Optional[str], last_modified: Optional[str], metadata: Dict):
+        """Store metadata for a URL with the validators it was served with"""
+        body = json.dumps(metadata)
+        with self.lock, self._connect() as db:
+            db.execute(
+                "INSERT OR REPLACE INTO registry (url, etag, last_modified, body) VALUES (?, ?, ?, ?)",
+                (url, etag, last_modified, body)
+            )
+    
+    def close(self):
+        with self.lock:
+            if self.db is not None:
+                self.db.close()
+                self.db = None
+
+registry_store = RegistryStore(REGISTRY_CACHE_PATH)
+
+class Upstream:
+    """HTTP/2 client for one upstream host, with a cap on its in-flight requests
+    
+    Created on startup so the semaphore belongs to the event loop serving the app.
+    """
+    
+    def __init__(self, max_concurrent_requests: int):
+        self.client = httpx.AsyncClient(http2=True, limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT)
+        self.semaphore = asyncio.Semaphore(max_concurrent_requests)
+    
+    async def aclose(self):
+        await self.client.aclose()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Keep one HTTP/2 client per upstream host for the lifetime of the app"""
+    app.state.pypi = package_checker.pypi = Upstream(MAX_CONCURRENT_REQUESTS)
+    app.state.npm = package_checker.npm = Upstream(MAX_CONCURRENT_REQUESTS)
+    app.state.osv = package_checker.osv = Upstream(2 * MAX_CONCURRENT_REQUESTS)
+    yield
+    await asyncio.gather(app.state.pypi.aclose(), app.state.npm.aclose(), app.state.osv.aclose())
+    registry_store.close()
+
 # Initializing the api
 app = FastAPI(
     title="Package Health Monitor Agent (A2A)",
     description="An A2A Protocol Agent that monitors package health and security",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # Package checking class
 class PackageChecker:
     """Class to check package health"""
     
+    def __init__(self):
+        # Assigned on application startup
+        self.pypi: Optional[Upstream] = None
+        self.npm: Optional[Upstream] = None
+        self.osv: Optional[Upstream] = None
+    
     async def analyze_python(self, packages: List[str]) -> Dict[str, Any]:
         """Analyze Python packages"""
+        return await self._analyze(self.parse_python(packages), check_pypi_package, self.pypi, "python")
+    
+    def stream_python(self, packages: List[PackageDependency]) -> AsyncIterator[Dict[str, Any]]:
+        """Analyze parsed Python packages, yielding each result as soon as it is ready"""
+        return self._stream(packages, check_pypi_package, self.pypi, "python")
+    
+    def parse_python(self, packages: List[str]) -> List[PackageDependency]:
+        """Parse requirement lines into package dependencies"""
         parsed_packages = []
         for pkg_str in packages:
-            pkg_str = pkg_str.strip()
+            # Environment markers don't change which package is checked
+            pkg_str = pkg_str.partition(';')[0].strip()
             if not pkg_str or pkg_str.startswith('#'):
                 continue
             
-            for op in ['==', '>=', '<=', '>', '<', '~=']:
-                if op in pkg_str:
-                    name, version = pkg_str.split(op, 1)
-                    parsed_packages.append(PackageDependency(name=name.strip(), version=version.strip()))
-                    break
-            else:
-                parsed_packages.append(PackageDependency(name=pkg_str, version=None))
-        
-        if not parsed_packages:
-            return {}
-        
-        results = []
-        outdated_count = 0
-        vulnerable_count = 0
-        deprecated_count = 0
-        
-        for pkg in parsed_packages:
-            pypi_info = check_pypi_package(pkg.name, pkg.version)
-            vulnerabilities = check_vulnerabilities_osv(pkg.name, "python")
-            
-            is_outdated = pypi_info['is_outdated']
-            has_vulns = len(vulnerabilities) > 0
-            is_deprecated = pypi_info.get('deprecated', False)
-            
-            if is_outdated:
-                outdated_count += 1
-            if has_vulns:
-                vulnerable_count += 1
-            if is_deprecated:
-                deprecated_count += 1
-            
-            health_score = calculate_health_score(is_outdated, len(vulnerabilities), is_deprecated)
-            recommendation = get_recommendation(health_score, is_outdated, len(vulnerabilities), is_deprecated)
-            
-            results.append({
-                "name": pkg.name,
-                "current_version": pkg.version,
-                "latest_version": pypi_info['latest_version'],
-                "is_outdated": is_outdated,
-                "has_vulnerabilities": has_vulns,
-                "vulnerability_count": len(vulnerabilities),
-                "is_deprecated": is_deprecated,
-                "health_score": health_score,
-                "recommendation": recommendation,
-                "vulnerabilities": vulnerabilities
-            })
-        
-        overall_score = sum(r["health_score"] for r in results) // len(results) if results else 0
+            match = _REQ_RE.match(pkg_str)
+            if match is None:
+                logger.warning(f"Skipping unparseable requirement: {pkg_str}")
+                continue
+            name, _, version = match.groups()
+            parsed_packages.append(PackageDependency(name=name, version=version or None))
         
-        return {
-            "total_packages": len(results),
-            "outdated_count": outdated_count,
-            "vulnerable_count": vulnerable_count,
-            "deprecated_count": deprecated_count,
-            "overall_health_score": overall_score,
-            "packages": results
-        }
+        return parsed_packages
     
     async def analyze_npm(self, dependencies: Dict[str, str]) -> Dict[str, Any]:
         """Analyze npm packages"""
-        if not dependencies:
-            return {}
-        
         packages = []
         for name, version in dependencies.items():
-            clean_version = version.lstrip('^~>=<')
+            clean_version = _NPM_PREFIX.sub('', version, count=1)
             packages.append(PackageDependency(name=name, version=clean_version))
         
-        results = []
-        outdated_count = 0
-        vulnerable_count = 0
-        deprecated_count = 0
+        return await self._analyze(packages, check_npm_package, self.npm, "npm")
+    
+    async def _analyze(self, packages: List[PackageDependency], check_registry: Callable, registry: Upstream, ecosystem: str) -> Dict[str, Any]:
+        """Analyze packages of one ecosystem against its registry and OSV"""
+        if not packages:
+            return {}
+        
+        # Registry metadata and vulnerabilities depend only on the package, so look each one up once
+        keys = [package_key(pkg.name, ecosystem) for pkg in packages]
+        names: Dict[str, str] = {}
+        for key, pkg in zip(keys, packages):
+            names.setdefault(key, pkg.name)
         
+        vulnerabilities, registry_infos = await asyncio.gather(
+            check_vulnerabilities_osv_batch(self.osv, [(name, ecosystem) for name in names.values()]),
+            asyncio.gather(*(check_registry(registry, name) for name in names.values()))
+        )
+        registry_info = dict(zip(names, registry_infos))
+        return self.summarize([
+            build_package_result(pkg, registry_info[key], vulnerabilities.get(names[key]))
+            for key, pkg in zip(keys, packages)
+        ])
+    
+    async def _stream(self, packages: List[PackageDependency], check_registry: Callable, registry: Upstream, ecosystem: str) -> AsyncIterator[Dict[str, Any]]:
+        """Analyze packages of one ecosystem, yielding results in completion order"""
+        packages_by_key: Dict[str, List[PackageDependency]] = {}
         for pkg in packages:
-            npm_info = check_npm_package(pkg.name, pkg.version)
-            vulnerabilities = check_vulnerabilities_osv(pkg.name, "npm")
-            
-            is_outdated = npm_info['is_outdated']
-            has_vulns = len(vulnerabilities) > 0
-            is_deprecated = npm_info.get('deprecated', False)
-            
-            if is_outdated:
-                outdated_count += 1
-            if has_vulns:
-                vulnerable_count += 1
-            if is_deprecated:
-                deprecated_count += 1
-            
-            health_score = calculate_health_score(is_outdated, len(vulnerabilities), is_deprecated)
-            recommendation = get_recommendation(health_score, is_outdated, len(vulnerabilities), is_deprecated)
-            
-            results.append({
-                "name": pkg.name,
-                "current_version": pkg.version,
-                "latest_version": npm_info['latest_version'],
-                "is_outdated": is_outdated,
-                "has_vulnerabilities": has_vulns,
-                "vulnerability_count": len(vulnerabilities),
-                "is_deprecated": is_deprecated,
-                "health_score": health_score,
-                "recommendation": recommendation,
-                "vulnerabilities": vulnerabilities
-            })
+            packages_by_key.setdefault(package_key(pkg.name, ecosystem), []).append(pkg)
         
-        overall_score = sum(r["health_score"] for r in results) // len(results) if results else 0
+        # Each line depends only on its own lookups, so no package waits on a shared OSV batch
+        async def analyze_package(same_packages: List[PackageDependency]) -> List[Dict[str, Any]]:
+            name = same_packages[0].name
+            registry_info, vulnerabilities = await asyncio.gather(
+                check_registry(registry, name),
+                check_vulnerabilities_osv(self.osv, name, ecosystem)
+            )
+            return [build_package_result(pkg, registry_info, vulnerabilities) for pkg in same_packages]
+        
+        tasks = [asyncio.ensure_future(analyze_package(same_packages)) for same_packages in packages_by_key.values()]
+        try:
+            for next_results in asyncio.as_completed(tasks):
+                for result in await next_results:
+                    yield result
+        finally:
+            # Stop outstanding lookups when the client disconnects mid-stream
+            for task in tasks:
+                task.cancel()
+    
+    def summarize(self, results: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Build an analysis result from already analyzed packages"""
+        if not results:
+            return {}
+        
+        outdated = vulnerable = deprecated = lookup_failed = score_sum = 0
+        for r in results:
+            outdated += r["is_outdated"]
+            vulnerable += r["has_vulnerabilities"]
+            deprecated += r["is_deprecated"]
+            lookup_failed += r["lookup_failed"]
+            score_sum += r["health_score"]
         
         return {
             "total_packages": len(results),
-            "outdated_count": outdated_count,
-            "vulnerable_count": vulnerable_count,
-            "deprecated_count": deprecated_count,
-            "overall_health_score": overall_score,
+            "outdated_count": outdated,
+            "vulnerable_count": vulnerable,
+            "deprecated_count": deprecated,
+            "lookup_failed_count": lookup_failed,
+            "overall_health_score": score_sum // len(results),
             "packages": results
         }
 
 # Helper functions (from original main.py)
-def check_pypi_package(package_name: str, current_version: Optional[str]) -> Dict:
-    """Check package on PyPI"""
-    try:
-        url = f"https://pypi.org/pypi/{package_name}/json"
-        response = requests.get(url, timeout=10)
+async def request_json(upstream: Upstream, method: str, url: str, **kwargs) -> tuple[int, Mapping[str, str], Optional[Any]]:
+    """Request an upstream API, returning (status, headers, JSON body if 200)"""
+    for attempt in range(MAX_RETRIES + 1):
+        try:
+            async with upstream.semaphore:
+                response = await upstream.client.request(method, url, **kwargs)
+        except httpx.TransportError as e:
+            # Connection resets and timeouts are as transient as a 503
+            if attempt == MAX_RETRIES:
+                raise
+            delay = RETRY_BACKOFF * 2 ** attempt
+            logger.warning(f"{method} {url} failed ({e!r}), retrying in {delay}s")
+            await asyncio.sleep(delay)
+            continue
         
         if response.status_code == 200:
-            data = response.json()
-            latest_version = data['info']['version']
-            is_outdated = current_version and current_version != latest_version
-            
-            logger.info(f"PyPI check: {package_name} - latest: {latest_version}, current: {current_version}, outdated: {is_outdated}")
-            
-            return {
-                'latest_version': latest_version,
-                'is_outdated': is_outdated,
-                'deprecated': False
-            }
-    except Exception as e:
-        logger.error(f"Error checking PyPI for {package_name}: {e}")
+            return response.status_code, response.headers, response.json()
+        if response.status_code not in RETRY_STATUSES or attempt == MAX_RETRIES:
+            return response.status_code, response.headers, None
+        
+        retry_after = response.headers.get("Retry-After", "")
+        delay = min(int(retry_after), 10) if retry_after.isdigit() else RETRY_BACKOFF * 2 ** attempt
+        logger.warning(f"{method} {url} returned {response.status_code}, retrying in {delay}s")
+        await asyncio.sleep(delay)
+
+async def fetch_json(upstream: Upstream, method: str, url: str, **kwargs) -> Optional[Any]:
+    """Request JSON from an upstream API, returning None unless it answers 200"""
+    _, _, data = await request_json(upstream, method, url, **kwargs)
+    return data
+
+async def fetch_registry(upstream: Upstream, url: str, extract: Callable[[Any], Dict]) -> Optional[Dict]:
+    """Fetch registry metadata, revalidating the stored copy with a conditional GET"""
+    # The persistent store only saves bandwidth; lookups fall back to plain GETs without it
+    try:
+        stored = await asyncio.to_thread(registry_store.get, url)
+    except sqlite3.Error as e:
+        logger.warning(f"Registry cache unavailable, fetching {url} unconditionally: {e}")
+        stored = None
+    headers = {}
+    if stored is not None:
+        etag, last_modified, _ = stored
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+    
+    status, response_headers, data = await request_json(upstream, "GET", url, headers=headers)
+    if status == 304 and stored is not None:
+        return stored[2]
+    if data is None:
+        return None
+    
+    metadata = extract(data)
+    try:
+        await asyncio.to_thread(registry_store.put, url, response_headers.get("ETag"), response_headers.get("Last-Modified"), metadata)
+    except sqlite3.Error as e:
+        logger.warning(f"Could not store registry metadata for {url}: {e}")
+    return metadata
+
+async def cached(cache: TTLCache, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+    """Return a cached value, fetching it once for all concurrent callers on a miss"""
+    if key in cache:
+        return cache[key]
+    
+    inflight_key = (id(cache), key)
+    task = _inflight.get(inflight_key)
+    if task is None:
+        task = _inflight[inflight_key] = asyncio.ensure_future(fetch())
+        task.add_done_callback(lambda _: _inflight.pop(inflight_key, None))
     
-    return {'latest_version': None, 'is_outdated': False, 'deprecated': False}
+    value = await asyncio.shield(task)
+    # Failed lookups return None and are retried on the next call
+    if value is not None:
+        cache[key] = value
+    return value
 
-def check_npm_package(package_name: str, current_version: Optional[str]) -> Dict:
+async def check_pypi_package(upstream: Upstream, package_name: str) -> Dict:
+    """Check package on PyPI"""
+    async def fetch() -> Optional[Dict]:
+        try:
+            url = f"https://pypi.org/pypi/{name}/json"
+            return await fetch_registry(
+                upstream, url,
+                lambda data: {'latest_version': data['info']['version'], 'deprecated': False}
+            )
+        except Exception as e:
+            logger.error(f"Error checking PyPI for {package_name}: {e}")
+        return None
+    
+    name = package_key(package_name, "python")
+    info = await cached(pypi_cache, name, fetch)
+    if info is None:
+        return {'latest_version': None, 'deprecated': False}
+    
+    logger.info(f"PyPI check: {package_name} - latest: {info['latest_version']}")
+    
+    return info
+
+async def check_npm_package(upstream: Upstream, package_name: str) -> Dict:
     """Check package on npm registry"""
-    try:
-        url = f"https://registry.npmjs.org/{package_name}"
-        response = requests.get(url, timeout=10)
-        
-        if response.status_code == 200:
-            data = response.json()
-            latest_version = data['dist-tags']['latest']
-            is_outdated = current_version and current_version != latest_version
+    async def fetch() -> Optional[Dict]:
+        try:
+            url = f"https://registry.npmjs.org/{package_name}"
+            return await fetch_registry(
+                upstream, url,
+                lambda data: {'latest_version': data['dist-tags']['latest'], 'deprecated': False}
+            )
+        except Exception as e:
+            logger.error(f"Error checking npm for {package_name}: {e}")
+        return None
+    
+    info = await cached(npm_cache, package_name, fetch)
+    if info is None:
+        return {'latest_version': None, 'deprecated': False}
+    
+    logger.info(f"npm check: {package_name} - latest: {info['latest_version']}")
+    
+    return info
+
+def package_key(name: str, ecosystem: str) -> str:
+    """Normalize a package name so every spelling of one package compares equal"""
+    # PyPI names are case-insensitive and treat runs of -, _ and . alike (PEP 503)
+    return _PYPI_SEPARATORS.sub('-', name).lower() if ecosystem == "python" else name
+
+def osv_ecosystem(ecosystem: str) -> str:
+    """Map an ecosystem to its OSV name"""
+    return "PyPI" if ecosystem == "python" else "npm"
+
+def format_vulnerability(vuln: Dict) -> Dict:
+    """Summarize an OSV vulnerability record"""
+    return {
+        'id': vuln.get('id'),
+        'summary': vuln.get('summary', 'No summary available'),
+        'severity': vuln.get('severity', [{}])[0].get('type', 'UNKNOWN') if vuln.get('severity') else 'UNKNOWN',
+        'published': vuln.get('published', '')
+    }
+
+async def check_vulnerabilities_osv(upstream: Upstream, package_name: str, ecosystem: str) -> Optional[List[Dict]]:
+    """Check vulnerabilities using OSV API, returning None if the check failed"""
+    async def fetch() -> Optional[List[Dict]]:
+        try:
+            payload = {
+                "package": {
+                    "name": package_name,
+                    "ecosystem": osv_ecosystem(ecosystem)
+                }
+            }
             
-            logger.info(f"npm check: {package_name} - latest: {latest_version}, current: {current_version}, outdated: {is_outdated}")
+            data = await fetch_json(upstream, "POST", f"{OSV_API}/query", json=payload)
             
-            return {
-                'latest_version': latest_version,
-                'is_outdated': is_outdated,
-                'deprecated': False
-            }
-    except Exception as e:
-        logger.error(f"Error checking npm for {package_name}: {e}")
+            if data is not None:
+                return [format_vulnerability(vuln) for vuln in data.get('vulns', [])]
+        except Exception as e:
+            logger.error(f"Error checking vulnerabilities for {package_name}: {e}")
+        return None
+    
+    return await cached(osv_cache, (ecosystem, package_name), fetch)
+
+async def check_vulnerability_details(upstream: Upstream, vuln_id: str) -> Dict:
+    """Fetch a single OSV vulnerability record"""
+    async def fetch() -> Optional[Dict]:
+        try:
+            data = await fetch_json(upstream, "GET", f"{OSV_API}/vulns/{vuln_id}")
+            if data is not None:
+                return format_vulnerability(data)
+        except Exception as e:
+            logger.error(f"Error fetching vulnerability {vuln_id}: {e}")
+        return None
     
-    return {'latest_version': None, 'is_outdated': False, 'deprecated': False}
+    details = await cached(osv_vuln_cache, vuln_id, fetch)
+    # Still report the vulnerability when its details are unavailable
+    return details if details is not None else format_vulnerability({'id': vuln_id})
 
-def check_vulnerabilities_osv(package_name: str, ecosystem: str) -> List[Dict]:
-    """Check vulnerabilities using OSV API"""
-    vulnerabilities = []
+async def check_vulnerabilities_osv_batch(upstream: Upstream, packages: List[Tuple[str, str]]) -> Dict[str, Optional[List[Dict]]]:
+    """Check vulnerabilities of (name, ecosystem) packages with OSV querybatch requests
     
-    try:
-        url = "https://api.osv.dev/v1/query"
+    Packages whose check failed map to None rather than to an empty list.
+    """
+    vulnerabilities = {}
+    missing = []
+    for name, ecosystem in dict.fromkeys(packages):
+        key = (ecosystem, name)
+        if key in osv_cache:
+            vulnerabilities[name] = osv_cache[key]
+        else:
+            missing.append((name, ecosystem))
+    
+    # Results come back in query order, listing only the ids of each package's vulnerabilities
+    vuln_ids: Dict[Tuple[str, str], List[str]] = {}
+    for start in range(0, len(missing), OSV_BATCH_SIZE):
+        chunk = missing[start:start + OSV_BATCH_SIZE]
         payload = {
-            "package": {
-                "name": package_name,
-                "ecosystem": "PyPI" if ecosystem == "python" else "npm"
-            }
+            "queries": [
+                {"package": {"name": name, "ecosystem": osv_ecosystem(ecosystem)}}
+                for name, ecosystem in chunk
+            ]
         }
         
-        response = requests.post(url, json=payload, timeout=10)
-        if response.status_code == 200:
-            data = response.json()
-            vulns = data.get('vulns', [])
-            
-            for vuln in vulns:
-                vulnerabilities.append({
-                    'id': vuln.get('id'),
-                    'summary': vuln.get('summary', 'No summary available'),
-                    'severity': vuln.get('severity', [{}])[0].get('type', 'UNKNOWN') if vuln.get('severity') else 'UNKNOWN',
-                    'published': vuln.get('published', '')
-                })
-    except Exception as e:
-        logger.error(f"Error checking vulnerabilities for {package_name}: {e}")
+        try:
+            data = await fetch_json(upstream, "POST", f"{OSV_API}/querybatch", json=payload)
+        except Exception as e:
+            logger.error(f"Error checking vulnerabilities for {len(chunk)} packages: {e}")
+            data = None
+        
+        results = data.get('results', []) if data is not None else []
+        for package, result in zip(chunk, results):
+            if result.get('next_page_token'):
+                logger.warning(f"OSV vulnerability list for {package[0]} is truncated to its first page")
+            vuln_ids[package] = [vuln['id'] for vuln in result.get('vulns', [])]
+        
+        # Without a result the package is unchecked, not free of vulnerabilities
+        for name, _ in chunk[len(results):]:
+            vulnerabilities[name] = None
+    
+    # Only packages that actually have vulnerabilities need their details fetched
+    unique_ids = list(dict.fromkeys(vuln_id for ids in vuln_ids.values() for vuln_id in ids))
+    details = dict(zip(unique_ids, await asyncio.gather(
+        *(check_vulnerability_details(upstream, vuln_id) for vuln_id in unique_ids)
+    )))
+    
+    for (name, ecosystem), ids in vuln_ids.items():
+        vulnerabilities[name] = osv_cache[(ecosystem, name)] = [details[vuln_id] for vuln_id in ids]
     
     return vulnerabilities
 
 def calculate_health_score(is_outdated: bool, vuln_count: int, is_deprecated: bool) -> int:
     """Calculate health score (0-100)"""
-    score = 100
-    
-    if is_outdated:
-        score -= 20
-    if vuln_count > 0:
-        score -= min(50, vuln_count * 15)
-    if is_deprecated:
-        score -= 30
-    
-    return max(0, score)
+    return max(0, 100 - 20 * is_outdated - min(50, 15 * vuln_count) - 30 * is_deprecated)
+
+# Recommendations for unhealthy packages, in order of priority
+_RECOMMENDATIONS = (
+    "Package is deprecated. Consider finding an alternative.",
+    "Update immediately! {} security vulnerability/ies found.",
+    "Update to the latest version when possible.",
+    "Review package health metrics.",
+)
 
 def get_recommendation(health_score: int, is_outdated: bool, vuln_count: int, is_deprecated: bool) -> str:
     """Get recommendation based on health metrics"""
     if health_score >= 80:
         return "Package is healthy!"
-    elif is_deprecated:
-        return "Package is deprecated. Consider finding an alternative."
-    elif vuln_count > 0:
-        return f"Update immediately! {vuln_count} security vulnerability/ies found."
-    elif is_outdated:
-        return "Update to the latest version when possible."
-    else:
-        return "Review package health metrics."
+    reasons = (is_deprecated, vuln_count > 0, is_outdated, True)
+    return _RECOMMENDATIONS[reasons.index(True)].format(vuln_count)
+
+def build_package_result(pkg: PackageDependency, registry_info: Dict, vulnerabilities: Optional[List[Dict]]) -> Dict[str, Any]:
+    """Build the health result of a single package, vulnerabilities being None if their check failed"""
+    latest_version = registry_info['latest_version']
+    is_outdated = bool(pkg.version and latest_version and pkg.version != latest_version)
+    is_deprecated = registry_info.get('deprecated', False)
+    # A failed registry lookup leaves no latest version to compare against
+    lookup_failed = latest_version is None or vulnerabilities is None
+    if vulnerabilities is None:
+        vulnerabilities = []
+    
+    health_score = calculate_health_score(is_outdated, len(vulnerabilities), is_deprecated)
+    recommendation = get_recommendation(health_score, is_outdated, len(vulnerabilities), is_deprecated)
+    # Don't call a package healthy when part of its check never ran
+    if lookup_failed and health_score >= 80:
+        recommendation = "Health check incomplete: registry or vulnerability lookup failed. Try again later."
+    
+    return {
+        "name": pkg.name,
+        "current_version": pkg.version,
+        "latest_version": latest_version,
+        "is_outdated": is_outdated,
+        "has_vulnerabilities": len(vulnerabilities) > 0,
+        "vulnerability_count": len(vulnerabilities),
+        "is_deprecated": is_deprecated,
+        "health_score": health_score,
+        "recommendation": recommendation,
+        "lookup_failed": lookup_failed,
+        "vulnerabilities": vulnerabilities
+    }
 
 # Initialize package checker and A2A handler
 package_checker = PackageChecker()
 a2a_handler = A2AHandler(package_checker)
 
+# Reported JSON-RPC request problems, most fundamental first
+_ENVELOPE_FIELDS = [(), ("jsonrpc",), ("id",), ("method",), ("params",)]
+_ENVELOPE_ERRORS = {
+    None: "Request must be a JSON object",
+    "jsonrpc": "jsonrpc must be '2.0'",
+    "id": "id must be a non-empty string",
+    "method": "method must be a string",
+    "params": "params is required",
+}
+
 # A2A Protocol Endpoint
 @app.post("/a2a", response_model=None)
 async def a2a_endpoint(request: Request):
@@ -279,7 +565,7 @@ async def a2a_endpoint(request: Request):
             body = await request.json()
         except Exception as e:
             logger.error(f"JSON parse error: {e}")
-            return JSONResponse(
+            return ORJSONResponse(
                 status_code=400,
                 content={
                     "jsonrpc": "2.0",
@@ -295,7 +581,7 @@ async def a2a_endpoint(request: Request):
         # Handle empty JSON - return 200 OK
         if not body or body == {}:
             logger.info("Received empty JSON, returning 200 OK")
-            return JSONResponse(
+            return ORJSONResponse(
                 status_code=200,
                 content={
                     "status": "ok",
@@ -304,53 +590,51 @@ async def a2a_endpoint(request: Request):
             )
         
         # Extract request ID early for error responses
-        request_id = body.get("id")
-        
-        # Validate JSON-RPC 2.0 structure
-        if body.get("jsonrpc") != "2.0":
-            logger.warning(f"Invalid jsonrpc version: {body.get('jsonrpc')}")
-            return JSONResponse(
-                status_code=400,
-                content={
-                    "jsonrpc": "2.0",
-                    "id": request_id,
-                    "error": {
-                        "code": -32600,
-                        "message": "Invalid Request",
-                        "data": {"details": "jsonrpc must be '2.0'"}
-                    }
-                }
-            )
-        
-        if not request_id:
-            logger.warning("Missing request id")
-            return JSONResponse(
-                status_code=400,
-                content={
-                    "jsonrpc": "2.0",
-                    "id": None,
-                    "error": {
-                        "code": -32600,
-                        "message": "Invalid Request",
-                        "data": {"details": "id is required"}
-                    }
-                }
-            )
+        request_id = body.get("id") if isinstance(body, dict) else None
         
-        # Validate and parse with Pydantic
+        # Validate JSON-RPC 2.0 structure and params in one pass
         try:
-            rpc_request = JSONRPCRequest(**body)
-        except Exception as e:
-            logger.error(f"Pydantic validation error: {e}")
-            return JSONResponse(
+            rpc_request = JSONRPCRequest.model_validate(body)
+        except ValidationError as e:
+            # Errors inside params are -32602; anything wrong with the request object itself is -32600
+            envelope_errors = [
+                error for error in e.errors()
+                if not (len(error["loc"]) > 1 and error["loc"][0] == "params")
+            ]
+            if not envelope_errors:
+                logger.error(f"Pydantic validation error: {e}")
+                return ORJSONResponse(
+                    status_code=400,
+                    content={
+                        "jsonrpc": "2.0",
+                        "id": request_id,
+                        "error": {
+                            "code": -32602,
+                            "message": "Invalid params",
+                            "data": {"details": str(e)}
+                        }
+                    }
+                )
+            
+            error = min(envelope_errors, key=lambda error: _ENVELOPE_FIELDS.index(error["loc"][:1]))
+            field = error["loc"][0] if error["loc"] else None
+            logger.warning(f"Invalid Request: {field or 'body'} - {error['msg']}")
+            
+            # Only a string naming an unsupported method is "not found"; any other value is malformed
+            if field == "method" and isinstance(body.get("method"), str):
+                code, message, details = -32601, "Method not found", f"Unknown method: {body.get('method')}"
+            else:
+                code, message, details = -32600, "Invalid Request", _ENVELOPE_ERRORS[field]
+            
+            return ORJSONResponse(
                 status_code=400,
                 content={
                     "jsonrpc": "2.0",
-                    "id": request_id,
+                    "id": None if field == "id" else request_id,
                     "error": {
-                        "code": -32602,
-                        "message": "Invalid params",
-                        "data": {"details": str(e)}
+                        "code": code,
+                        "message": message,
+                        "data": {"details": details}
                     }
                 }
             )
@@ -360,13 +644,15 @@ async def a2a_endpoint(request: Request):
         # Process with A2A handler
         response = await a2a_handler.handle_message(rpc_request)
         
-        logger.info(f"A2A response generated - bytes: {len(str(response.model_dump()))}")
+        # Serialize once, reusing the encoded body for both the log and the response
+        payload = response.model_dump_json()
+        logger.info(f"A2A response generated - bytes: {len(payload)}")
         
-        return JSONResponse(content=response.model_dump())
+        return Response(content=payload, media_type="application/json")
     
     except Exception as e:
         logger.exception(f"Internal error in A2A endpoint: {e}")
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=500,
             content={
                 "jsonrpc": "2.0",
@@ -379,6 +665,16 @@ async def a2a_endpoint(request: Request):
             }
         )
 
+@app.get("/artifacts/{artifact_id}")
+async def get_artifact(artifact_id: str):
+    """Serve analysis data referenced by an A2A artifact"""
+    data = a2a_handler.get_artifact(artifact_id)
+    
+    if data is None:
+        raise HTTPException(status_code=404, detail="Artifact not found or expired")
+    
+    return data
+
 # Standard API endpoints (keep for backward compatibility)
 @app.get("/")
 async def root():
@@ -391,8 +687,10 @@ async def root():
             "/a2a": "A2A Protocol endpoint (POST - for Telex integration)",
             "/health": "Check API health (GET)",
             "/analyze/python": "Analyze Python packages (POST)",
+            "/analyze/python/stream": "Analyze Python packages, streaming NDJSON results (POST)",
             "/analyze/npm": "Analyze npm packages (POST)",
-            "/check-package": "Check single package health (POST with ?ecosystem=python or ?ecosystem=npm)"
+            "/check-package": "Check single package health (POST with ?ecosystem=python or ?ecosystem=npm)",
+            "/artifacts/{artifact_id}": "Fetch an A2A analysis artifact (GET)"
         }
     }
 
@@ -409,7 +707,22 @@ async def analyze_python_dependencies(request: PythonDependenciesRequest):
     if not result:
         raise HTTPException(status_code=400, detail="No valid packages found")
     
-    return OverallHealthResponse(**result)
+    # Results are built internally, so skip revalidating them against response_model
+    return ORJSONResponse(content=result)
+
+@app.post("/analyze/python/stream")
+async def stream_python_dependencies(request: PythonDependenciesRequest):
+    """Analyze Python dependencies, streaming one package result per line as each completes"""
+    packages = package_checker.parse_python(request.packages)
+    
+    if not packages:
+        raise HTTPException(status_code=400, detail="No valid packages found")
+    
+    async def stream_results():
+        async for result in package_checker.stream_python(packages):
+            yield orjson.dumps(result) + b"\n"
+    
+    return StreamingResponse(stream_results(), media_type="application/x-ndjson")
 
 @app.post("/analyze/npm", response_model=OverallHealthResponse)
 async def analyze_npm_dependencies(request: NpmDependenciesRequest):
@@ -420,7 +733,8 @@ async def analyze_npm_dependencies(request: NpmDependenciesRequest):
     if not result:
         raise HTTPException(status_code=400, detail="No valid packages found")
     
-    return OverallHealthResponse(**result)
+    # Results are built internally, so skip revalidating them against response_model
+    return ORJSONResponse(content=result)
 
 @app.post("/check-package", response_model=PackageHealthResponse)
 async def check_single_package(package: PackageDependency, ecosystem: str = Query(..., description="Ecosystem type: 'python' or 'npm'")):
@@ -438,32 +752,14 @@ async def check_single_package(package: PackageDependency, ecosystem: str = Quer
     
     if ecosystem == "python":
         logger.info(f"Checking PyPI for {package.name}")
-        pkg_info = check_pypi_package(package.name, package.version)
+        pkg_info = await check_pypi_package(app.state.pypi, package.name)
     else:
         logger.info(f"Checking npm for {package.name}")
-        pkg_info = check_npm_package(package.name, package.version)
-    
-    vulnerabilities = check_vulnerabilities_osv(package.name, ecosystem)
-    
-    is_outdated = pkg_info.get('is_outdated', False)
-    has_vulns = len(vulnerabilities) > 0
-    is_deprecated = pkg_info.get('deprecated', False)
+        pkg_info = await check_npm_package(app.state.npm, package.name)
     
-    health_score = calculate_health_score(is_outdated, len(vulnerabilities), is_deprecated)
-    recommendation = get_recommendation(health_score, is_outdated, len(vulnerabilities), is_deprecated)
+    vulnerabilities = await check_vulnerabilities_osv(app.state.osv, package.name, ecosystem)
     
-    return PackageHealthResponse(
-        name=package.name,
-        current_version=package.version,
-        latest_version=pkg_info.get('latest_version'),
-        is_outdated=is_outdated,
-        has_vulnerabilities=has_vulns,
-        vulnerability_count=len(vulnerabilities),
-        is_deprecated=is_deprecated,
-        health_score=health_score,
-        recommendation=recommendation,
-        vulnerabilities=vulnerabilities
-    )
+    return ORJSONResponse(content=build_package_result(package, pkg_info, vulnerabilities))
 
 if __name__ == "__main__":
     import uvicorn
@@ -36,6 +36,7 @@ class MessageConfiguration(BaseModel):
     blocking: bool = True
     acceptedOutputModes: Optional[List[str]] = ["text/plain", "image/png", "image/svg+xml"]
     pushNotificationConfig: Optional[PushNotificationConfig] = None
+    inlineArtifacts: bool = False  # Embed analysis results instead of /artifacts references
 
 class MessageParams(BaseModel):
     model_config = ConfigDict(extra='allow')
@@ -49,13 +50,14 @@ class ExecuteParams(BaseModel):
     contextId: Optional[str] = None
     taskId: Optional[str] = None
     messages: List[A2AMessage]
+    configuration: Optional[MessageConfiguration] = Field(default_factory=MessageConfiguration)
 
 class JSONRPCRequest(BaseModel):
     """JSON-RPC 2.0 Request for A2A Protocol"""
     model_config = ConfigDict(extra='allow')
     
-    jsonrpc: Literal["2.0"] = "2.0"
-    id: str
+    jsonrpc: Literal["2.0"]
+    id: str = Field(min_length=1)
     method: Literal["message/send", "execute"]
     params: Union[MessageParams, ExecuteParams]
 
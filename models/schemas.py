@@ -28,6 +28,7 @@ class PackageHealthResponse(BaseModel):
     is_deprecated: bool
     health_score: int
     recommendation: str
+    lookup_failed: bool = False
     vulnerabilities: List[Dict] = []
 
 
@@ -36,5 +37,6 @@ class OverallHealthResponse(BaseModel):
     outdated_count: int
     vulnerable_count: int
     deprecated_count: int
+    lookup_failed_count: int = 0
     overall_health_score: int
     packages: List[PackageHealthResponse]
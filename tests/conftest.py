@@ -0,0 +1,53 @@
+import os
+import tempfile
+
+# Keep the persistent registry store out of the working tree; set before main_a2a is imported
+os.environ.setdefault("REGISTRY_CACHE_PATH", os.path.join(tempfile.mkdtemp(), "registry.sqlite"))
+
+import httpx
+import orjson
+import pytest
+
+import main_a2a
+from main_a2a import PackageChecker, Upstream
+
+LATEST = {"flask": "3.0.0", "requests": "2.32.3", "lodash": "4.17.21", "axios": "1.7.0"}
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    """Start every test with empty lookup caches"""
+    for cache in (main_a2a.pypi_cache, main_a2a.npm_cache, main_a2a.osv_cache, main_a2a.osv_vuln_cache):
+        cache.clear()
+    yield
+
+@pytest.fixture
+def upstream_requests():
+    """Requests received by the mocked upstream APIs"""
+    return []
+
+@pytest.fixture
+def checker(upstream_requests):
+    """PackageChecker whose PyPI, npm and OSV clients answer from httpx.MockTransport"""
+    def handler(request: httpx.Request) -> httpx.Response:
+        upstream_requests.append(request)
+        host, path = request.url.host, request.url.path
+        if host == "pypi.org":
+            name = path.split("/")[2].lower()
+            return httpx.Response(200, json={"info": {"version": LATEST[name]}})
+        if host == "registry.npmjs.org":
+            return httpx.Response(200, json={"dist-tags": {"latest": LATEST[path.lstrip("/")]}})
+        if path == "/v1/querybatch":
+            queries = orjson.loads(request.content)["queries"]
+            return httpx.Response(200, json={"results": [{} for _ in queries]})
+        return httpx.Response(404)
+    
+    def mock_upstream() -> Upstream:
+        upstream = Upstream(4)
+        upstream.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        return upstream
+    
+    package_checker = PackageChecker()
+    package_checker.pypi = mock_upstream()
+    package_checker.npm = mock_upstream()
+    package_checker.osv = mock_upstream()
+    return package_checker
@@ -0,0 +1,40 @@
+import asyncio
+
+from a2a_handler import A2AHandler
+
+def test_batcher_splits_results_per_caller(checker, upstream_requests):
+    handler = A2AHandler(checker)
+    
+    async def run():
+        return await asyncio.gather(
+            handler.python_batcher.submit(["flask==2.0.1", "requests==2.32.3"]),
+            handler.python_batcher.submit(["flask==3.0.0"]),
+        )
+    
+    first, second = asyncio.run(run())
+    
+    assert [(pkg["name"], pkg["current_version"]) for pkg in first["packages"]] == [("flask", "2.0.1"), ("requests", "2.32.3")]
+    assert [(pkg["name"], pkg["current_version"]) for pkg in second["packages"]] == [("flask", "3.0.0")]
+    assert first["outdated_count"] == 1 and second["outdated_count"] == 0
+    # Both callers shared one backend call
+    assert [request.url.path for request in upstream_requests].count("/v1/querybatch") == 1
+    assert sum(request.url.host == "pypi.org" for request in upstream_requests) == 2
+
+def test_npm_batch_groups_versions_of_one_package(checker):
+    handler = A2AHandler(checker)
+    
+    async def run():
+        return await asyncio.gather(
+            handler.npm_batcher.submit([("lodash", "4.17.20")]),
+            handler.npm_batcher.submit([("lodash", "4.17.21"), ("axios", "1.7.0")]),
+        )
+    
+    first, second = asyncio.run(run())
+    
+    assert [(pkg["name"], pkg["current_version"], pkg["is_outdated"]) for pkg in first["packages"]] == [
+        ("lodash", "4.17.20", True),
+    ]
+    assert [(pkg["name"], pkg["current_version"], pkg["is_outdated"]) for pkg in second["packages"]] == [
+        ("lodash", "4.17.21", False),
+        ("axios", "1.7.0", False),
+    ]
@@ -0,0 +1,37 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from main_a2a import app
+
+client = TestClient(app)
+
+MESSAGE = {"message": {"role": "user", "parts": [{"kind": "text", "text": "help"}]}}
+
+@pytest.mark.parametrize("body, code, request_id", [
+    ([1, 2], -32600, None),
+    ({"id": "1", "method": "message/send", "params": MESSAGE}, -32600, "1"),
+    ({"jsonrpc": "1.0", "id": "1", "method": "message/send", "params": MESSAGE}, -32600, "1"),
+    ({"jsonrpc": "2.0", "id": "", "method": "message/send", "params": MESSAGE}, -32600, None),
+    ({"jsonrpc": "2.0", "id": "1", "method": 5, "params": MESSAGE}, -32600, "1"),
+    ({"jsonrpc": "2.0", "id": "1", "method": "tasks/cancel", "params": MESSAGE}, -32601, "1"),
+    ({"jsonrpc": "2.0", "id": "1", "method": "message/send", "params": {"message": {"role": "user"}}}, -32602, "1"),
+])
+def test_error_codes(body, code, request_id):
+    response = client.post("/a2a", json=body)
+    
+    assert response.status_code == 400
+    assert response.json()["error"]["code"] == code
+    assert response.json()["id"] == request_id
+
+def test_parse_error():
+    response = client.post("/a2a", content=b'{"jsonrpc": "2.0",', headers={"Content-Type": "application/json"})
+    
+    assert response.status_code == 400
+    assert response.json()["error"]["code"] == -32700
+
+def test_help_request_succeeds():
+    response = client.post("/a2a", json={"jsonrpc": "2.0", "id": "1", "method": "message/send", "params": MESSAGE})
+    
+    assert response.status_code == 200
+    assert response.json()["id"] == "1"
+    assert "error" not in response.json() or response.json()["error"] is None
@@ -0,0 +1,65 @@
+import asyncio
+
+from main_a2a import cached
+
+def test_parse_python_extras_and_markers(checker):
+    packages = checker.parse_python([
+        "requests[security,socks]>=2.25.0 ; python_version >= '3.8'",
+        "uvicorn[standard]==0.32.1",
+        "pywin32==306; sys_platform == 'win32'",
+        "# a comment",
+        "",
+        "Django",
+        "not a requirement!",
+    ])
+    
+    assert [(pkg.name, pkg.version) for pkg in packages] == [
+        ("requests", "2.25.0"),
+        ("uvicorn", "0.32.1"),
+        ("pywin32", "306"),
+        ("Django", None),
+    ]
+
+def test_cached_fetches_once_for_concurrent_callers():
+    cache = {}
+    calls = []
+    
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"latest_version": "1.0"}
+    
+    async def run():
+        results = await asyncio.gather(*(cached(cache, "pkg", fetch) for _ in range(5)))
+        results.append(await cached(cache, "pkg", fetch))
+        return results
+    
+    results = asyncio.run(run())
+    
+    assert len(calls) == 1
+    assert all(result == {"latest_version": "1.0"} for result in results)
+
+def test_cached_retries_failed_lookups():
+    cache = {}
+    calls = []
+    
+    async def fetch():
+        calls.append(1)
+        return None
+    
+    async def run():
+        await cached(cache, "pkg", fetch)
+        await cached(cache, "pkg", fetch)
+    
+    asyncio.run(run())
+    
+    assert len(calls) == 2
+    assert "pkg" not in cache
+
+def test_analyze_python_looks_up_each_normalized_name_once(checker, upstream_requests):
+    result = asyncio.run(checker.analyze_python(["Flask==2.0.1", "flask==3.0.0", "requests"]))
+    
+    registry_paths = [request.url.path for request in upstream_requests if request.url.host == "pypi.org"]
+    assert sorted(registry_paths) == ["/pypi/flask/json", "/pypi/requests/json"]
+    assert [pkg["is_outdated"] for pkg in result["packages"]] == [True, False, False]
+    assert result["lookup_failed_count"] == 0